@@ -2,13 +2,13 @@
 
 import os
 import json
+import itertools
 
 import numpy as np
-import plotly.graph_objs as go
 
 HEIGHT = 500
 WIDTH = HEIGHT * (1.5 + np.sqrt(5)) / 2  # golden ratio.
-MARGIN = dict(l=80, r=80, t=100, b=80)
+MARGIN = {"l": 80, "r": 80, "t": 100, "b": 80}
 
 # fonts
 FONT_FAMILY = "Trebuchet MS"
@@ -27,23 +27,98 @@ PALETTE = [
     '#edc948', '#b07aa1', '#ff9da7', '#9c755f', '#bab0ac'
 ]
 
-
-def palette(n=1, theme=PALETTE):
+# plot area, excluding margins.
+VERTICAL_SPACE = HEIGHT - MARGIN['t'] - MARGIN['b']
+HORIZONTAL_SPACE = WIDTH - MARGIN['l'] - MARGIN['r']
+
+# annotation positions, proportionate to the plot area. Fonts are left out
+# of the templates so every annotation gets its own font dict.
+Y_TILT = 0  # y-label tilt.
+_LABEL_X = -(MARGIN['l'] - 20) / HORIZONTAL_SPACE
+_TITLE_Y = 1 + (MARGIN['t'] - 10) / VERTICAL_SPACE
+_YLABEL_Y = 1 + (MARGIN['t'] - 20 - TITLE_SIZE - Y_TILT) / VERTICAL_SPACE
+_XLABEL_Y = -(MARGIN['b'] - 10) / VERTICAL_SPACE
+
+_TITLE_TMPL = {
+    "x": _LABEL_X,
+    "y": _TITLE_Y,
+    "xref": "paper",
+    "xanchor": "left",
+    "yref": "paper",
+    "yanchor": "top",
+    "showarrow": False,
+}
+
+_YLABEL_TMPL = {
+    "x": _LABEL_X,
+    "y": _YLABEL_Y,
+    "xref": "paper",
+    "xanchor": "left",
+    "yref": "paper",
+    "yanchor": "top",
+    "showarrow": False,
+}
+
+_XLABEL_TMPL = {
+    "x": 0.5,
+    "y": _XLABEL_Y,
+    "xref": "paper",
+    "xanchor": "center",
+    "yref": "paper",
+    "yanchor": "bottom",
+    "showarrow": False,
+}
+
+# layout prototypes, copied and merged with per-chart settings. Nested dicts
+# are left out and built per call, so layouts never share them.
+_GRID_WIDTH = 2
+
+_AXIS_PROTO = {
+    "ticklen": 5,
+    "tickwidth": _GRID_WIDTH,
+    "showgrid": True,
+    "gridcolor": WHITE,
+    "gridwidth": _GRID_WIDTH,
+    "zeroline": False,
+    "linewidth": 6,
+    "linecolor": GREY,
+}
+
+_LEGEND_PROTO = {
+    "bgcolor": LIGHT_GREY,
+    "bordercolor": LIGHT_GREY,
+    "borderwidth": 1,
+    "xanchor": "left",
+    "yanchor": "bottom",
+    "x": 1.08,  # legend X position.
+    "y": 0.  # legend Y position.
+}
+
+_CANVAS_PROTO = {
+    "width": WIDTH,
+    "height": HEIGHT,
+    "plot_bgcolor": WHITE,
+    "paper_bgcolor": WHITE,
+}
+
+
+def palette(n=0, theme=PALETTE):
     """Cycle through color palette and return a color."""
 
-    color_length = len(theme)
+    return theme[n % len(theme)]
+
 
-    if n > len(theme):
-        color = theme[n - color_length - 1]
-    else:
-        color = theme[n - 1]
+def palette_many(k, theme=PALETTE):
+    """Cycle through color palette and return the first k colors."""
 
-    return color
+    return list(itertools.islice(itertools.cycle(theme), k))
 
 
 class Layout():
     """Set of default parameteres for the chart layout."""
 
+    __slots__ = ("title", "xlabel", "ylabel", "y2label")
+
     def __init__(
         self, title, xlabel, ylabel, y2label=None, theme="default.json"
     ):
@@ -67,66 +142,35 @@ class Layout():
             annotations (tuple): Fixed title, xlabel, and ylabel settings.
         """
 
-        y_tilt = 0  # y-label tilt.
-        vertical_space = HEIGHT - MARGIN['t'] - MARGIN['b']
-        horizontal_space = WIDTH - MARGIN['l'] - MARGIN['r']
-
-        title = dict(
-            x=-(MARGIN['l'] - 20) / horizontal_space,
-            y=1 + (MARGIN['t'] - 10) / vertical_space,
-            font=dict(size=TITLE_SIZE, color=DARK_TEXT),
-            xref="paper",
-            xanchor="left",
-            yref="paper",
-            yanchor="top",
-            text=self.title,
-            showarrow=False,
-        )
-
-        ylabel = dict(
-            x=-(MARGIN['l'] - 20) / horizontal_space,
-            y=1 + (MARGIN['t'] - 20 - TITLE_SIZE - y_tilt) / vertical_space,
-            font=dict(size=FONT_SIZE, color=LIGHT_TEXT),
-            xref="paper",
-            xanchor="left",
-            yref="paper",
-            yanchor="top",
-            text=self.ylabel,
-            showarrow=False,
-        )
-
-        xlabel = dict(
-            x=0.5,
-            y=-(MARGIN['b'] - 10) / vertical_space,
-            font=dict(size=FONT_SIZE, color=LIGHT_TEXT),
-            xref="paper",
-            xanchor="center",
-            yref="paper",
-            yanchor="bottom",
-            text=self.xlabel,
-            showarrow=False,
+        annotations = (
+            {
+                **_TITLE_TMPL,
+                "font": {"size": TITLE_SIZE, "color": DARK_TEXT},
+                "text": self.title,
+            },
+            {
+                **_YLABEL_TMPL,
+                "font": {"size": FONT_SIZE, "color": LIGHT_TEXT},
+                "text": self.ylabel,
+            },
+            {
+                **_XLABEL_TMPL,
+                "font": {"size": FONT_SIZE, "color": LIGHT_TEXT},
+                "text": self.xlabel,
+            },
         )
 
-        annotations = (title, ylabel, xlabel)
-
         return annotations
 
 
     def _canvas_white(self):
         """Build a white canvas with grey grid layout."""
 
-        font_dict = dict(family=FONT_FAMILY)
-
-        canvas_layout = dict(
-            width=WIDTH,
-            height=HEIGHT,
-            font=font_dict,
-            hoverlabel=dict(font=font_dict),
-            plot_bgcolor=WHITE,
-            paper_bgcolor=WHITE,
-            margin=MARGIN,
-            annotations=self._annotations()
-        )
+        canvas_layout = _CANVAS_PROTO.copy()
+        canvas_layout["font"] = {"family": FONT_FAMILY}
+        canvas_layout["hoverlabel"] = {"font": {"family": FONT_FAMILY}}
+        canvas_layout["margin"] = MARGIN.copy()
+        canvas_layout["annotations"] = self._annotations()
 
         return canvas_layout
 
@@ -134,64 +178,20 @@ class Layout():
     def _axis_no_titles(self, axis_args=None):
         """Build the chart axes layout."""
 
-        grid_width = 2
-
-        axis_layout = dict(
-            tickfont=dict(size=FONT_SIZE),
-            ticklen=5,
-            tickwidth=grid_width,
-            showgrid=True,
-            gridcolor=WHITE,
-            gridwidth=grid_width,
-            zeroline=False,
-            linewidth=6,
-            linecolor=GREY,
-        )
+        axis_layout = _AXIS_PROTO.copy()
+        axis_layout["tickfont"] = {"size": FONT_SIZE}
 
         if axis_args is not None:
-            axis_layout.update(**axis_args)
+            axis_layout.update(axis_args)
 
         return axis_layout
 
 
-    # def _white_axis_no_titles(self, axis_args, **kwargs):
-    #     """Generate visualisation white axis layout."""
-
-    #     grid_width = 2
-
-    #     axis_layout = dict(
-    #         tickfont=dict(size=FONT_SIZE),
-    #         ticklen=5,
-    #         tickwidth=grid_width,
-    #         showgrid=True,
-    #         gridcolor=GREY,
-    #         gridwidth=grid_width,
-    #         zeroline=False,
-    #         linewidth=6,
-    #         linecolor=WHITE,
-    #     )
-
-    #     if axis_args:
-    #         axis_layout.update(**axis_args)
-
-    #     # update other axis arguments.
-    #     axis_layout.update(**kwargs)
-
-    #     return axis_layout
-
     def _legend_grey(self):
         """Build legend layout."""
 
-        legend = dict(
-            bgcolor=LIGHT_GREY,
-            bordercolor=LIGHT_GREY,
-            borderwidth=1,
-            font=dict(size=FONT_SIZE, color=DARK_TEXT),
-            xanchor="left",
-            yanchor="bottom",
-            x=1.08,  # legend X position.
-            y=0.  # legend Y position.
-        )
+        legend = _LEGEND_PROTO.copy()
+        legend["font"] = {"size": FONT_SIZE, "color": DARK_TEXT}
 
         return legend
 
@@ -204,49 +204,45 @@ class Layout():
             formatted_axis (dict): Formatted Y-axis argument in dict.
         """
 
-        y2_args = axis
-
-        if "overlaying" not in y2_args:
-            y2_args['overlaying'] = "y"
-
-        if "side" not in y2_args:
-            y2_args['side'] = "right"
+        axis.setdefault("overlaying", "y")
+        axis.setdefault("side", "right")
 
-        return y2_args
+        return axis
 
-    def one_axis_layout(self, axis_setting=None):
+    def one_axis_layout(self, axis_setting=None, barmode=None):
         """Build layout and style for 1 y-axis chart.
 
         Args:
             axis_setting (dict): Custom x/y-axis settings.
+            barmode (str): Plotly barmode, e.g. 'stack' or 'overlay'.
         Return:
             layout (dict):
         """
 
         canvas = self._canvas_white()
 
-        x_axis = None
-        y_axis = None
-
         # separate x and y-axis arguments.
-        if axis_setting is not None:
-            x_axis = axis_setting["x"] if "x" in axis_setting.keys() else None
-            y_axis = axis_setting["y"] if "y" in axis_setting.keys() else None
-
-        layout = go.Layout(
-            xaxis=self._axis_no_titles(x_axis),
-            yaxis=self._axis_no_titles(y_axis),
-            legend=self._legend_grey(),
+        x_axis = axis_setting.get("x") if axis_setting else None
+        y_axis = axis_setting.get("y") if axis_setting else None
+
+        layout = {
+            "xaxis": self._axis_no_titles(x_axis),
+            "yaxis": self._axis_no_titles(y_axis),
+            "legend": self._legend_grey(),
+            "barmode": barmode,
             **canvas  # canvas-related settings.
-        )
+        }
 
         return layout
 
-    def two_y_axes(self, axis_args, **kwargs):
+    def two_y_axes(self, axis_args, barmode=None):
         """Generate chart layout with two y-axis.
 
         Args:
             axis_args (dict): Arguments for x/y axes.
+            barmode (str): Plotly barmode, e.g. 'stack'.
+        Return:
+            layout (dict):
         """
 
         canvas = self._canvas_white()
@@ -254,36 +250,17 @@ class Layout():
         # include necessary arguments for y2-axis.
         y2_args = self._format_to_y2(axis_args['y2'])
 
-        axis_layout = go.Layout(
-            xaxis=self._white_axis_no_titles(axis_args['x']),
-            yaxis=self._white_axis_no_titles(axis_args['y']),
-            yaxis2=self._white_axis_no_titles(y2_args),
-            legend=self._legend_grey(),
+        axis_layout = {
+            "xaxis": self._axis_no_titles(axis_args['x']),
+            "yaxis": self._axis_no_titles(axis_args['y']),
+            "yaxis2": self._axis_no_titles(y2_args),
+            "legend": self._legend_grey(),
+            "barmode": barmode,
             **canvas
-        )
+        }
 
         return axis_layout
 
-    # def two_columns_subplot(self, axis_args, **kwargs):
-    #     """Generate chart layout with side-by-side subplots.
-
-    #     Args:
-    #         axis_args (dict): Arguments for x/y axes.
-    #     """
-
-    #     canvas = self._canvas_white()
-    #     canvas.update(**kwargs)
-
-    #     subplot_layout = go.Layout(
-    #         xaxis=self._white_axis_no_titles(axis_args['x'], domain=[0, .4]),
-    #         yaxis=self._white_axis_no_titles(axis_args['y']),
-    #         xaxis2=self._white_axis_no_titles(axis_args['x'], domain=[.5, .9]),
-    #         yaxis2=self._white_axis_no_titles(axis_args['x'], anchor='x2'),
-    #         **canvas
-    #     )
-
-    #     return subplot_layout
-
 
 class Theme():
     """Reads layout settings from JSON file."""
@@ -1,12 +1,58 @@
+import functools
+
+import numpy as np
 import pandas as pd
-import plotly as py
-import plotly.graph_objs as go
-import re
 
-from chart_layout import Layout, palette
+from chart_layout import Layout, palette_many
+
+# plotly is imported on the first chart, see _ensure_notebook.
+py = None
+_notebook_initialized = False
+
+
+def _ensure_notebook():
+    """Import plotly and initialize plotly offline mode, once."""
+
+    global py, _notebook_initialized
+
+    if not _notebook_initialized:
+        import plotly as py
+        py.offline.init_notebook_mode(connected=True)
+        _notebook_initialized = True
+
+
+@functools.lru_cache(maxsize=16)
+def _template_dict(name):
+    """Convert (and cache) a registered plotly template to a plain dict.
+
+    Unvalidated figures must be plain dicts all the way down. The result is
+    shared by every chart, so treat it as read-only.
+    """
+
+    return py.io.templates[name].to_plotly_json()
+
+
+def _plot(figure):
+    """Render a figure dict in the notebook.
+
+    iplot is called without validation, which is where plotly would fill in
+    its default template, so the template is set on the layout here.
+    """
+
+    _ensure_notebook()
 
-# initialize plotly offline mode.
-py.offline.init_notebook_mode(connected=True)
+    template = py.io.templates.default
+    if template is not None and "template" not in figure["layout"]:
+        figure["layout"]["template"] = _template_dict(template)
+
+    py.offline.iplot(figure, validate=False)
+
+
+@functools.lru_cache(maxsize=512)
+def _default_label(column_name):
+    """Build (and cache) the default axis label for a column."""
+
+    return column_name.replace('_', ' ')
 
 
 class Visualize():
@@ -23,6 +69,8 @@ class Visualize():
             multiple columns.
     """
 
+    __slots__ = ("df", "annotations", "barmode")
+
     def __init__(self, data):
 
         self.df = self._to_dataframe(data)
@@ -58,108 +106,50 @@ class Visualize():
             label (str): Formatted Axis label.
         """
 
-        if label is None:
-            return column_name.replace('_', ' ')
-        else:
-            return label
-
-    def _make_hbar_plot(self, x, y, n, **kwargs):
-        """Build data plots for horizontal bar.
-
-        Args:
-            x (str): X-axis column a.k.a dimension.
-            y (str): Y-axis column a.k.a measures.
-            n (int): Sequence.
-        Returns:
-            hbar (dict): data for horizontal bar plot.
-        """
-
-        y_values = [float(v) for v in self.df[y]]
-        hbar = go.Bar(
-            x=y_values,
-            y=self.df[x],
-            name=y,
-            marker=dict(color=palette(n)),
-            orientation='h',
-            **kwargs
-        )
-
-        return hbar
-
-    def _make_vbar_plot(self, x, y, n, **kwargs):
-        """Build data plots for vertical bar.
-
-        Args:
-            x (str): X-axis column a.k.a dimension.
-            y (str): Y-axis column a.k.a measures.
-            n (int): Sequence.
-        Returns:
-            vbar (dict): Data for vertical bar plot.
-        """
-
-        y_values = [float(v) for v in self.df[y]]
-        vbar = go.Bar(
-            x=self.df[x],
-            y=y_values,
-            name=y,
-            marker=dict(color=palette(n)),
-            **kwargs
-        )
-
-        return vbar
+        return label if label is not None else _default_label(column_name)
 
-    def _make_dist_plot(
-        self, column_name, n, overlay=False, prob=False, cumsum=False,
-        **kwargs
+    def _traces_from_columns(
+        self, x, columns, kind, colors, horizontal=False, **kwargs
     ):
-        """Build data plots for distribution.
+        """Build data plots for several columns in one pass.
+
+        The measure columns are converted to one float block and the
+        dimension column to one array, shared by every trace.
 
         Args:
-            values (list):
-            n (int): Sequence.
+            x (str): X-axis column a.k.a dimension. Use None for
+                distributions, which plot the measures on the x-axis.
+            columns (list): Y-axis columns a.k.a measures.
+            kind (str): Plotly trace type, e.g. 'bar' or 'scatter'.
+            colors (list): One color per column.
+            horizontal (bool): Swap axes for horizontal bars.
         Returns:
-            dist (dict): Data for distribution plot.
+            traces (list): Data plots, one per column.
         """
 
-        opacity = .5 if overlay else None
-        histogram_mode = 'probability' if prob else None
-
-        values = [float(v) for v in self.df[column_name]]
-        dist = go.Histogram(
-            x=values,
-            opacity=opacity,
-            name=column_name,
-            marker=dict(color=palette(n)),
-            histnorm=histogram_mode,
-            cumulative=dict(enabled=cumsum),
-            **kwargs
+        values = self.df[columns].to_numpy(dtype=np.float64, copy=False)
+        value_axis, dimension_axis = (
+            ("x", "y") if horizontal or x is None else ("y", "x")
         )
 
-        return dist
-
-    def _make_scatter_plot(self, x, y, n, mode, **kwargs):
-        """Build data plots for scatter.
-
-        Args:
-            x (str): X-axis column a.k.a dimension.
-            y (str): Y-axis column a.k.a measures.
-            n (int): Sequence.
-            mode (str): Lines/Scatter mode.
-        Returns:
-            scatter (dict): Data for scatter plot.
+        if x is not None:
+            kwargs[dimension_axis] = self.df[x].to_numpy(copy=False)
 
-        """
+        if horizontal:
+            kwargs["orientation"] = "h"
 
-        y_values = [float(v) for v in self.df[y]]
-        scatter = go.Scatter(
-            x=self.df[x],
-            y=y_values,
-            name=y,
-            mode=mode,
-            marker=dict(color=palette(n)),
-        )
+        traces = [
+            {
+                "type": kind,
+                value_axis: values[:, n],
+                "name": column_name,
+                "marker": {"color": colors[n]},
+                **kwargs
+            }
+            for n, column_name in enumerate(columns)
+        ]
 
-        return scatter
+        return traces
 
     def bar(
         self, x, y, title, stack=False, horizontal=False,
@@ -179,34 +169,29 @@ class Visualize():
             status (bool): Visualization success.
         """
 
-        data = []
         y = y if isinstance(y, list) else [y]
 
-        for n, value_name in enumerate(y):
-            if horizontal:
-                bar = self._make_hbar_plot(x, value_name, n)
-            else:
-                bar = self._make_vbar_plot(x, value_name, n)
-
-            data.append(bar)
+        data = self._traces_from_columns(
+            x, y, "bar", palette_many(len(y)), horizontal=horizontal,
+        )
 
         # set title, xlabel, and ylabels.
         annotations = dict(
-            chart_title=title,
+            title=title,
             xlabel=self._format_labels(x, xlabel),
             ylabel=self._format_labels(y[0], ylabel),
         )
         style = Layout(**annotations)
 
-        layout = style.default(
-            axis_args={
+        layout = style.one_axis_layout(
+            axis_setting={
                 'x': dict(range=x_range),
                 'y': dict(range=y_range),
             },
             barmode='stack' if stack else None,
         )
-        figure = go.Figure(data=data, layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        figure = dict(data=data, layout=layout)
+        _plot(figure)
 
         return True
 
@@ -231,29 +216,21 @@ class Visualize():
             status (bool): Visualization success.
         """
 
-        data = []
         bars = bars if isinstance(bars, list) else [bars]
         lines = lines if isinstance(lines, list) else [lines]
 
-        for n, bar_name in enumerate(bars):
-            bar = self._make_vbar_plot(x, bar_name, n)
-
-            data.append(bar)
-
-        for n, line_name in enumerate(lines):
-            line = go.Scatter(
-                x=self.df[x],
-                y=[float(v) for v in self.df[line_name]],
-                name=line_name,
-                mode="lines+markers",
-                marker=dict(color=palette(n + 1)),
-                yaxis="y2",
-            )
-            data.append(line)
+        bar_traces = self._traces_from_columns(
+            x, bars, "bar", palette_many(len(bars)),
+        )
+        line_traces = self._traces_from_columns(
+            x, lines, "scatter", palette_many(len(lines) + 1)[1:],
+            mode="lines+markers", yaxis="y2",
+        )
+        data = bar_traces + line_traces
 
         # set title, xlabel, and ylabels.
         annotations = dict(
-            chart_title=title,
+            title=title,
             xlabel=self._format_labels(x, xlabel),
             ylabel=self._format_labels(bars[0], bar_label),
             y2label=self._format_labels(lines[0], line_label),
@@ -268,8 +245,8 @@ class Visualize():
             },
             barmode='stack' if stack else None,
         )
-        figure = go.Figure(data=data, layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        figure = dict(data=data, layout=layout)
+        _plot(figure)
 
         return True
 
@@ -292,36 +269,32 @@ class Visualize():
             status (bool): Visualization success.
         """
 
-        data = []
         y = values if isinstance(values, list) else [values]
 
-        for n, column_name in enumerate(y):
-            histogram = self._make_dist_plot(
-                column_name=column_name,
-                n=n,
-                overlay=overlay,
-                prob=prob,
-                cumsum=cumsum,
-            )
-            data.append(histogram)
+        data = self._traces_from_columns(
+            None, y, "histogram", palette_many(len(y)),
+            opacity=.5 if overlay else None,
+            histnorm='probability' if prob else None,
+            cumulative=dict(enabled=cumsum),
+        )
 
         # set title, xlabel, ylabels.
         annotations = dict(
-            chart_title=title,
-            xlabel=self._format_labels(values, label),
+            title=title,
+            xlabel=self._format_labels(y[0], label),
             ylabel="Probability (%)" if prob else "Count",
         )
         style = Layout(**annotations)
 
-        layout = style.default(
-            axis_args={
+        layout = style.one_axis_layout(
+            axis_setting={
                 'x': dict(range=x_range),
                 'y': dict(range=y_range),
             },
             barmode='overlay' if overlay else None
         )
-        figure = go.Figure(data=data, layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        figure = dict(data=data, layout=layout)
+        _plot(figure)
 
         return True
 
@@ -331,31 +304,27 @@ class Visualize():
     ):
         """Generate line chart."""
 
-        data = []
         y = y if isinstance(y, list) else [y]
 
-        for n, value_name in enumerate(y):
-            line = self._make_scatter_plot(
-                x=x, y=value_name, n=n,
-                mode="lines+markers",
-            )
-            data.append(line)
+        data = self._traces_from_columns(
+            x, y, "scatter", palette_many(len(y)), mode="lines+markers",
+        )
 
         annotations = dict(
-            chart_title=title,
+            title=title,
             xlabel=self._format_labels(x, xlabel),
             ylabel=self._format_labels(y[0], ylabel),
         )
         style = Layout(**annotations)
 
-        layout = style.default(
-            axis_args={
+        layout = style.one_axis_layout(
+            axis_setting={
                 'x': dict(range=x_range),
                 'y': dict(range=y_range),
             }
         )
-        figure = go.Figure(data=data, layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        figure = dict(data=data, layout=layout)
+        _plot(figure)
 
     def scatter(
         self, x, y, title=None, x_range=None, y_range=None,
@@ -363,51 +332,46 @@ class Visualize():
     ):
         """Generate scatter plot."""
 
-        data = []
         y = y if isinstance(y, list) else [y]
 
-        for n, value_name in enumerate(y):
-            line = self._make_scatter_plot(
-                x=x,
-                y=value_name,
-                n=n,
-                mode="markers",
-            )
-            data.append(line)
+        data = self._traces_from_columns(
+            x, y, "scatter", palette_many(len(y)), mode="markers",
+        )
 
         annotations = dict(
-            chart_title=title,
+            title=title,
             xlabel=self._format_labels(x, xlabel),
             ylabel=self._format_labels(y[0], ylabel),
         )
         style = Layout(**annotations)
 
-        layout = style.default(
-            axis_args={
+        layout = style.one_axis_layout(
+            axis_setting={
                 'x': dict(range=x_range),
                 'y': dict(range=y_range),
             }
         )
-        figure = go.Figure(data=data, layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        figure = dict(data=data, layout=layout)
+        _plot(figure)
 
     def pie(self, x, y, title=None, xlabel=None, ylabel=None):
         """Generate pie chart."""
 
-        pie = go.Pie(
-            labels=self.df[x],
-            values=[float(v) for v in self.df[y]],
+        pie = dict(
+            type="pie",
+            labels=self.df[x].to_numpy(copy=False),
+            values=self.df[y].to_numpy(dtype=np.float64, copy=False),
             name=x,
             hole=.4,
-            marker=dict(colors=palette(as_list=True)),
+            marker=dict(colors=palette_many(len(self.df))),
         )
 
         annotations = dict(
-            chart_title=title,
+            title=title,
             xlabel=self._format_labels(x, xlabel),
-            ylabel=self._format_labels(y[0], ylabel),
+            ylabel=self._format_labels(y, ylabel),
         )
         style = Layout(**annotations)
-        layout = style.default()
-        figure = go.Figure(data=[pie], layout=layout)
-        py.offline.iplot(figure, show_link=False)
+        layout = style.one_axis_layout()
+        figure = dict(data=[pie], layout=layout)
+        _plot(figure)
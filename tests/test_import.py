@@ -0,0 +1,99 @@
+"""Smoke tests for importing the chart modules."""
+
+import os
+import sys
+
+import pandas as pd
+import plotly.io as pio
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+import chart_layout  # noqa: E402
+import charts  # noqa: E402
+
+
+def test_import():
+    assert charts.Visualize
+    assert chart_layout.Layout
+
+
+def test_two_y_axes():
+    style = chart_layout.Layout("title", "x", "y", y2label="y2")
+    layout = style.two_y_axes(
+        axis_args={
+            'x': {'range': None},
+            'y': {'range': None},
+            'y2': {'range': None},
+        },
+    )
+
+    assert layout["yaxis2"]["overlaying"] == "y"
+    assert layout["yaxis2"]["side"] == "right"
+
+
+@pytest.fixture
+def shown(monkeypatch):
+    """Render charts through the real pio.show and record each figure."""
+
+    charts._ensure_notebook()
+    monkeypatch.setattr(pio.renderers, "default", "json")
+
+    figures = []
+    show = pio.show
+
+    def record(figure, *args, **kwargs):
+        figures.append(figure)
+        return show(figure, *args, **kwargs)
+
+    monkeypatch.setattr(pio, "show", record)
+
+    return figures
+
+
+def test_bar_renders(shown):
+    v = charts.Visualize(pd.DataFrame({"city": ["a", "b"], "s": [1, 2]}))
+
+    assert v.bar("city", "s", "title")
+    assert len(shown) == 1
+
+
+def test_bar_uses_current_data(shown):
+    v = charts.Visualize(pd.DataFrame({"city": ["a", "b"], "s": [1, 2]}))
+    v.bar("city", "s", "title")
+    v.df["s"] = [10, 20]
+    v.bar("city", "s", "title")
+
+    assert list(shown[-1]["data"][0]["y"]) == [10., 20.]
+
+
+def test_palette_wraps_around():
+    assert chart_layout.palette(0) == chart_layout.PALETTE[0]
+    assert chart_layout.palette(10) == chart_layout.PALETTE[0]
+    assert chart_layout.palette_many(11)[-1] == chart_layout.PALETTE[0]
+
+
+def test_bar_traces_per_column(shown):
+    df = pd.DataFrame({"city": ["a", "b"], "s": [1, 2], "t": [3, 4]})
+    charts.Visualize(df).bar("city", ["s", "t"], "title", stack=True)
+
+    data = shown[-1]["data"]
+    layout = shown[-1]["layout"]
+    assert [trace["type"] for trace in data] == ["bar", "bar"]
+    assert [trace["name"] for trace in data] == ["s", "t"]
+    assert layout["barmode"] == "stack"
+    assert layout["annotations"][0]["text"] == "title"
+
+
+def test_pie_ylabel(shown):
+    df = pd.DataFrame({"city": ["a", "b"], "unit_sales": [1, 2]})
+    charts.Visualize(df).pie("city", "unit_sales", "title")
+
+    assert shown[-1]["layout"]["annotations"][1]["text"] == "unit sales"
+
+
+def test_dist_label_for_columns(shown):
+    df = pd.DataFrame({"s_a": [1, 2], "t": [3, 4]})
+    charts.Visualize(df).dist(["s_a", "t"], "title")
+
+    assert shown[-1]["layout"]["annotations"][2]["text"] == "s a"